@@ -0,0 +1,325 @@
+import time
+import enum
+import os
+import atexit
+import signal
+import threading
+from dataclasses import dataclass
+
+#---------------------------
+# 1. State Definitions
+#---------------------------
+class ADCSState(enum.IntEnum):
+    DETUMBLING = 1
+    SUN_ACQUISITION = 2
+    NOMINAL_POINTING = 3
+    SAFE_MODE = 4
+
+#---------------------------
+# 2. Global Constants and Files
+#---------------------------
+LOG_FILE = 'adcs_log.txt'
+CONTROL_LOOP_INTERVAL = 5  # seconds per control cycle
+
+# Fault thresholds
+ANGULAR_RATE_THRESHOLD = 5.0      # Degrees per second threshold for detumbling
+SUN_ALIGNMENT_THRESHOLD = 5.0     # Acceptable sun alignment error (degrees)
+SAFE_POWER_THRESHOLD = 19         # Critical power threshold (%)
+
+# Persistence counters for fault conditions
+HIGH_RATE_PERSISTENCE_COUNT = 3   # Consecutive cycles with high angular rate
+SENSOR_FAIL_PERSISTENCE_COUNT = 3 # Consecutive sensor failures
+
+LOG_BUFFER_SIZE = 64 * 1024       # Bytes buffered before the log is written out
+LOG_FLUSH_INTERVAL = 10           # Control cycles between periodic log flushes
+DEBUG = os.environ.get('ADCS_DEBUG') == '1'  # Echo log messages to the console
+
+# Global counters (persist across cycles)
+high_rate_counter = 0
+sensor_fail_counter = 0
+
+#---------------------------
+# 3. Logging Function (Error Handling)
+#---------------------------
+# The log is opened once and buffered; run() flushes it every LOG_FLUSH_INTERVAL
+# control cycles and immediately after every state transition. The descriptor is
+# opened with O_DSYNC, so each flush returns only once the data is on disk.
+_log_file = os.fdopen(
+    os.open(LOG_FILE, os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, 'O_DSYNC', 0), 0o644),
+    'ab', buffering=LOG_BUFFER_SIZE)
+atexit.register(_log_file.close)
+
+def stamp_cycle():
+    """Refresh the timestamp prefix shared by every log line of the current control cycle."""
+    global _log_prefix
+    _log_prefix = time.strftime("[%d-%m-%Y %H:%M:%S] ").encode()
+
+stamp_cycle()
+
+def log_event(message, critical=False):
+    _log_file.write(_log_prefix + message.encode() + b"\n")
+    if critical:
+        _log_file.flush()  # Make critical events durable without waiting for the next flush
+    if DEBUG:
+        print(message)
+
+def log_line(line):
+    """Log a message that is already encoded as bytes, trailing newline included."""
+    _log_file.write(_log_prefix + line)
+    if DEBUG:
+        print(line.decode(), end='')
+
+#---------------------------
+# 4. Sensor Snapshot
+#---------------------------
+@dataclass(slots=True)
+class SensorSnapshot:
+    """One set of sensor/system measurements, shared by everything in a control cycle."""
+    angular_rate: float
+    sun_error: float
+    quaternion_error: float
+    power_ok: bool
+    sensors_ok: bool
+    eclipse: bool
+
+#---------------------------
+# 5. ADCS Operation Functions
+#---------------------------
+# Fixed log lines, encoded once so the steady-state branches skip message formatting
+DETUMBLING_SAFE_LINE = b"[DETUMBLING] Angular rate within safe limits; ready to transition.\n"
+SUN_ALIGNED_LINE = b"[SUN_ACQUISITION] Sun alignment achieved; ready to transition to NOMINAL POINTING.\n"
+ATTITUDE_STABLE_LINE = b"[NOMINAL_POINTING] Attitude stable and within tolerance.\n"
+SAFE_MODE_LINE = b"[SAFE_MODE] Entering safe mode. Minimizing actuator usage and conserving power.\n"
+
+def detumbling_control(snapshot):
+    """Detumbling: reduce angular rate using magnetorquers (Bang-Bang control)."""
+    angular_rate = snapshot.angular_rate
+    if angular_rate > ANGULAR_RATE_THRESHOLD:
+        torque = -0.1 if angular_rate > 0 else 0.1
+        log_event(f"[DETUMBLING] Angular rate: {angular_rate:.2f}°/s, applying torque: {torque:.3f} Nm")
+    else:
+        log_line(DETUMBLING_SAFE_LINE)
+
+def sun_acquisition(snapshot):
+    """Sun Acquisition: align solar panels via proportional control."""
+    sun_error = snapshot.sun_error
+    if sun_error > SUN_ALIGNMENT_THRESHOLD:
+        control_torque = -0.05 * sun_error
+        log_event(f"[SUN_ACQUISITION] Sun error: {sun_error:.2f}°, applying control torque: {control_torque:.3f} Nm")
+    else:
+        log_line(SUN_ALIGNED_LINE)
+
+def nominal_pointing(snapshot):
+    """Nominal Pointing: maintain desired attitude using PD control (reaction wheels)."""
+    error = snapshot.quaternion_error
+    if error > 0.5:
+        reaction_wheel_torque = -0.1 * error
+        log_event(f"[NOMINAL_POINTING] Orientation error: {error:.2f}°, applying reaction wheel torque: {reaction_wheel_torque:.3f} Nm")
+    else:
+        log_line(ATTITUDE_STABLE_LINE)
+
+def safe_mode(snapshot):
+    """Safe Mode: minimal operations to conserve power and protect system."""
+    log_line(SAFE_MODE_LINE)
+
+# Operation executed each control cycle for every state
+STATE_HANDLERS = {
+    ADCSState.DETUMBLING: detumbling_control,
+    ADCSState.SUN_ACQUISITION: sun_acquisition,
+    ADCSState.NOMINAL_POINTING: nominal_pointing,
+    ADCSState.SAFE_MODE: safe_mode,
+}
+
+#---------------------------
+# 6. Persistence Functions for Recovery
+#---------------------------
+# The state is journaled in the log itself as "|STATE|<value>" lines, written at
+# startup and on every transition. Recovery takes the last such line, scanning the
+# log backwards from the end in fixed-size chunks.
+STATE_RECORD_TAG = b"|STATE|"
+STATE_SCAN_CHUNK = 4096
+STATE_RECORDS = {state: STATE_RECORD_TAG + b"%d\n" % state for state in ADCSState}
+
+def save_state(state):
+    """Persist the current state to non-volatile memory."""
+    try:
+        _log_file.write(STATE_RECORDS[state])
+    except IOError as e:
+        log_event(f"Error saving state: {e}", critical=True)
+
+def _parse_state_record(line):
+    """Return the ADCSState stored in a journal line, or None if it is not a valid state record."""
+    if not line.startswith(STATE_RECORD_TAG):
+        return None
+    try:
+        return ADCSState(int(line[len(STATE_RECORD_TAG):]))
+    except ValueError:
+        return None  # Torn or corrupted record
+
+def _read_last_state_record(f):
+    """Return the state in the last valid state record of the open log file, or None."""
+    end = f.seek(0, os.SEEK_END)
+    partial = b""  # Start of the earliest line seen so far, which may continue in an earlier chunk
+    while end > 0:
+        start = max(0, end - STATE_SCAN_CHUNK)
+        f.seek(start)
+        lines = (f.read(end - start) + partial).split(b"\n")
+        if start > 0:
+            partial = lines.pop(0)
+        for line in reversed(lines):
+            state = _parse_state_record(line)
+            if state is not None:
+                return state
+        end = start
+    return None
+
+def load_state():
+    """Load the last known state from non-volatile memory; default to DETUMBLING if not available."""
+    try:
+        with open(LOG_FILE, 'rb') as f:
+            state = _read_last_state_record(f)
+        if state is not None:
+            return state
+    except IOError as e:
+        log_event(f"Error loading state: {e}", critical=True)
+    log_event("No valid saved state found, defaulting to DETUMBLING.")
+    return ADCSState.DETUMBLING
+
+#---------------------------
+# 7. State Transition Logic
+#---------------------------
+def state_transition(current_state, snapshot):
+    """Determine the next state based on all cases and persistent fault conditions."""
+    global high_rate_counter, sensor_fail_counter
+
+    # Use this cycle's sensor/system measurements
+    angular_rate = snapshot.angular_rate
+    sun_error = snapshot.sun_error
+    power_ok = snapshot.power_ok
+    eclipse = snapshot.eclipse
+
+    # -------------------------------
+    # Case 1: Sensor Anomalies
+    # -------------------------------
+    # A failed check is retried on the next cycle; the counter provides the persistence.
+    if not snapshot.sensors_ok:
+        sensor_fail_counter += 1
+        log_event(f"Sensor check failed ({sensor_fail_counter} consecutive failures).")
+    else:
+        sensor_fail_counter = 0
+    if sensor_fail_counter >= SENSOR_FAIL_PERSISTENCE_COUNT:
+        log_event("Persistent sensor anomalies detected. Transitioning to SAFE_MODE.")
+        return ADCSState.SAFE_MODE
+
+    # -------------------------------
+    # Case 2: High Angular Rate
+    # -------------------------------
+    if angular_rate > ANGULAR_RATE_THRESHOLD:
+        high_rate_counter += 1
+        log_event(f"High angular rate detected ({high_rate_counter} consecutive cycles).")
+    else:
+        high_rate_counter = 0
+    if high_rate_counter >= HIGH_RATE_PERSISTENCE_COUNT:
+        log_event("Angular rate remains high persistently. Transitioning to DETUMBLING.")
+        return ADCSState.DETUMBLING
+
+    # -------------------------------
+    # Case 3: Low Power Handling
+    # -------------------------------
+    if not power_ok and eclipse:
+        log_event("Critical fault: Low power during eclipse. Transitioning to SAFE_MODE.")
+        return ADCSState.SAFE_MODE
+
+    # -------------------------------
+    # Case 4: Nominal Operations
+    # -------------------------------
+    # If sun alignment error is within acceptable limits, transition to NOMINAL_POINTING.
+    if sun_error < SUN_ALIGNMENT_THRESHOLD:
+        log_event("Sun alignment is acceptable. Transitioning to NOMINAL_POINTING.")
+        return ADCSState.NOMINAL_POINTING
+    else:
+        log_event("Sun alignment not achieved. Remaining in SUN_ACQUISITION.")
+        return ADCSState.SUN_ACQUISITION
+
+#---------------------------
+# 8. Main Loop (Event-Driven FSM)
+#---------------------------
+def _start_cycle_timer():
+    """Start the control cadence; return (wait_for_next_cycle, stop_cycle_timer) functions."""
+    # ITIMER_REAL signals the whole process, and only the main thread can be relied on
+    # to receive them, so other threads fall back to deadline sleeps
+    if (threading.current_thread() is threading.main_thread()
+            and all(hasattr(signal, name) for name in ('setitimer', 'sigwait', 'sigpending', 'pthread_sigmask'))):
+        # SIGALRM stays blocked and is collected with sigwait(), so every expiry of the
+        # periodic timer starts one cycle without running a signal handler. sigwait()
+        # is not interrupted by other signals, so SIGINT is waited for as well and
+        # handed to its handler, keeping Ctrl-C as prompt as an interrupted sleep.
+        wait_signals = {signal.SIGALRM, signal.SIGINT}
+        previous_mask = signal.pthread_sigmask(signal.SIG_BLOCK, wait_signals)
+        signal.setitimer(signal.ITIMER_REAL, CONTROL_LOOP_INTERVAL, CONTROL_LOOP_INTERVAL)
+
+        def wait_for_next_cycle():
+            while signal.sigwait(wait_signals) == signal.SIGINT:
+                handler = signal.getsignal(signal.SIGINT)
+                if callable(handler):
+                    handler(signal.SIGINT, None)  # The default handler raises KeyboardInterrupt
+                elif handler != signal.SIG_IGN:
+                    raise KeyboardInterrupt
+
+        def stop_cycle_timer():
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            if signal.SIGALRM in signal.sigpending():
+                signal.sigwait({signal.SIGALRM})  # Discard a tick that would otherwise kill the process once unblocked
+            signal.pthread_sigmask(signal.SIG_SETMASK, previous_mask)
+
+        return wait_for_next_cycle, stop_cycle_timer
+
+    # Otherwise sleep until fixed deadlines so the time spent in a cycle does not
+    # push the following ones back
+    next_cycle_time = time.monotonic()
+
+    def wait_for_next_cycle():
+        nonlocal next_cycle_time
+        next_cycle_time += CONTROL_LOOP_INTERVAL
+        sleep_time = next_cycle_time - time.monotonic()
+        if sleep_time > 0:
+            time.sleep(sleep_time)
+
+    return wait_for_next_cycle, lambda: None
+
+def run(sample_sensors):
+    """Run the ADCS control loop, reading each cycle's measurements from sample_sensors()."""
+    stamp_cycle()
+    current_state = load_state()  # Load persistent state (processor reset recovery)
+    log_event(f"System starting in state: {current_state.name}")
+    save_state(current_state)  # Journal the state for recovery; recorded again only on transitions
+
+    cycle_count = 0
+    wait_for_next_cycle, stop_cycle_timer = _start_cycle_timer()
+    try:
+        while True:
+            stamp_cycle()
+
+            # Sample the sensors once; the operation and the transition logic share the readings
+            snapshot = sample_sensors()
+
+            # Execute the operation corresponding to the current state
+            STATE_HANDLERS[current_state](snapshot)
+        
+            # Determine next state based on persistent fault checks and system conditions
+            next_state = state_transition(current_state, snapshot)
+            if next_state != current_state:
+                log_event(f"Transitioning from {current_state.name} to {next_state.name}")
+                current_state = next_state
+                save_state(current_state)
+                _log_file.flush()  # Transitions (including SAFE_MODE entry) reach the log right away
+        
+            # Periodically write out the buffered log lines
+            cycle_count += 1
+            if cycle_count % LOG_FLUSH_INTERVAL == 0:
+                _log_file.flush()
+
+            # Wait for the next control loop iteration
+            wait_for_next_cycle()
+    finally:
+        stop_cycle_timer()  # Leave the process signal state as it was found
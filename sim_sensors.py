@@ -0,0 +1,49 @@
+import random
+
+from adcs_core import SAFE_POWER_THRESHOLD, SensorSnapshot, log_event
+
+#---------------------------
+# Simulated Sensor & System Functions
+#---------------------------
+# Dedicated generator for the simulation, with its methods bound once
+_rng = random.Random()
+_uniform = _rng.uniform
+_random = _rng.random
+
+def get_angular_rate():
+    """Return simulated angular rate (deg/s) with noise."""
+    return _uniform(0, 10)
+
+def get_sun_vector():
+    """Return simulated sun alignment error (degrees)."""
+    return _uniform(0, 30)
+
+def get_quaternion_error():
+    """Return simulated orientation error for nominal pointing (degrees)."""
+    return _uniform(0, 5)
+
+def check_power():
+    """Simulate power level monitoring; log power level and return True if above threshold."""
+    power_level = _uniform(10, 100)
+    log_event(f"Power level: {power_level:.1f}%")
+    return power_level > SAFE_POWER_THRESHOLD
+
+def check_sensors():
+    """Simulate sensor health check with 10% failure probability."""
+    failure_probability = 0.1
+    return _random() > failure_probability
+
+def in_eclipse():
+    """Simulate eclipse detection (assume 40% chance of being in eclipse)."""
+    return _random() < 0.4
+
+def sample_sensors():
+    """Read every sensor once for the current control cycle."""
+    return SensorSnapshot(
+        angular_rate=get_angular_rate(),
+        sun_error=get_sun_vector(),
+        quaternion_error=get_quaternion_error(),
+        power_ok=check_power(),
+        sensors_ok=check_sensors(),
+        eclipse=in_eclipse(),
+    )
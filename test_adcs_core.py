@@ -0,0 +1,113 @@
+import io
+import os
+import signal
+import tempfile
+import threading
+import time
+import unittest
+
+import adcs_core
+from adcs_core import ADCSState
+
+
+def read_last_state(data, chunk_size):
+    adcs_core.STATE_SCAN_CHUNK = chunk_size
+    return adcs_core._read_last_state_record(io.BytesIO(data))
+
+
+class ReadLastStateRecordTest(unittest.TestCase):
+    CHUNK_SIZES = (1, 3, 7, 8, 9, 16, 4096)
+
+    def setUp(self):
+        self.addCleanup(setattr, adcs_core, 'STATE_SCAN_CHUNK', adcs_core.STATE_SCAN_CHUNK)
+
+    def test_empty_log(self):
+        for chunk_size in self.CHUNK_SIZES:
+            self.assertIsNone(read_last_state(b"", chunk_size))
+
+    def test_record_split_across_chunks(self):
+        data = b"[ts] Power level: 50.0%\n|STATE|2\n[ts] Sun error: 12.00\xc2\xb0\n|STATE|3\n[ts] done\n"
+        for chunk_size in self.CHUNK_SIZES:
+            self.assertIs(read_last_state(data, chunk_size), ADCSState.NOMINAL_POINTING)
+
+    def test_record_at_start_of_file(self):
+        for chunk_size in self.CHUNK_SIZES:
+            self.assertIs(read_last_state(b"|STATE|4\n[ts] message\n", chunk_size), ADCSState.SAFE_MODE)
+
+    def test_torn_record_falls_back_to_previous(self):
+        for tail in (b"|STATE|", b"|STATE|\n", b"|STATE|9\n", b"|STA"):
+            for chunk_size in self.CHUNK_SIZES:
+                self.assertIs(read_last_state(b"|STATE|3\n" + tail, chunk_size), ADCSState.NOMINAL_POINTING)
+
+    def test_tag_inside_a_line_is_ignored(self):
+        data = b"|STATE|4\n[ts] Sensor '|STATE|' oops\n[ts] x|STATE|1\n"
+        for chunk_size in self.CHUNK_SIZES:
+            self.assertIs(read_last_state(data, chunk_size), ADCSState.SAFE_MODE)
+
+
+@unittest.skipUnless(hasattr(signal, 'setitimer'), "interval timers are not available")
+class RunSignalStateTest(unittest.TestCase):
+    def setUp(self):
+        log_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(log_dir.cleanup)
+        for name, value in (('LOG_FILE', os.path.join(log_dir.name, 'adcs_log.txt')),
+                            ('_log_file', io.BytesIO()),
+                            ('CONTROL_LOOP_INTERVAL', 0.01)):
+            self.addCleanup(setattr, adcs_core, name, getattr(adcs_core, name))
+            setattr(adcs_core, name, value)
+
+    @staticmethod
+    def failing_sensors(cycles):
+        """Return a sensor provider that raises RuntimeError on its cycles-th sample."""
+        samples = []
+
+        def sample_sensors():
+            samples.append(None)
+            if len(samples) == cycles:
+                raise RuntimeError("sensor bus fault")
+            return adcs_core.SensorSnapshot(0.0, 0.0, 0.0, True, True, False)
+
+        return sample_sensors
+
+    def test_timer_and_signal_mask_restored_when_run_raises(self):
+        with self.assertRaises(RuntimeError):
+            adcs_core.run(self.failing_sensors(3))
+
+        self.assertEqual(signal.getitimer(signal.ITIMER_REAL), (0.0, 0.0))
+        self.assertNotIn(signal.SIGALRM, signal.pthread_sigmask(signal.SIG_BLOCK, []))
+        self.assertNotIn(signal.SIGALRM, signal.sigpending())
+
+    def test_sigint_interrupts_the_cycle_wait(self):
+        adcs_core.CONTROL_LOOP_INTERVAL = 3
+        interrupt = threading.Timer(0.2, signal.pthread_kill, (threading.main_thread().ident, signal.SIGINT))
+        started = time.monotonic()
+        interrupt.start()
+        try:
+            with self.assertRaises(KeyboardInterrupt):
+                adcs_core.run(self.failing_sensors(5))
+        finally:
+            interrupt.cancel()
+
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertNotIn(signal.SIGINT, signal.pthread_sigmask(signal.SIG_BLOCK, []))
+
+    def test_run_in_worker_thread_leaves_signals_alone(self):
+        errors = []
+
+        def worker():
+            try:
+                adcs_core.run(self.failing_sensors(20))
+            except RuntimeError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(signal.getitimer(signal.ITIMER_REAL), (0.0, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()